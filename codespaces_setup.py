@@ -6,10 +6,14 @@ Automatically configures the environment and sets up the automation
 
 import os
 import json
+import re
 import subprocess
 import sys
 from pathlib import Path
 
+# Single-pass scan for secret names whose values should be masked
+_SENSITIVE_RE = re.compile(r'PASSWORD|TOKEN|KEY')
+
 def check_github_secrets():
     """Check if all required GitHub Secrets are configured"""
     print("🔍 Checking GitHub Secrets configuration...")
@@ -28,7 +32,7 @@ def check_github_secrets():
     for secret in required_secrets:
         value = os.getenv(secret)
         if value:
-            if 'PASSWORD' in secret or 'TOKEN' in secret or 'KEY' in secret:
+            if _SENSITIVE_RE.search(secret):
                 masked_value = value[:4] + '*' * (len(value) - 4)
                 print(f"✅ {secret}: {masked_value}")
             else:
@@ -85,6 +89,23 @@ def install_dependencies():
         print(f"Error output: {e.stderr}")
         return False
 
+def precompile_sources():
+    """Byte-compile the project scripts so later runs skip parse+compile"""
+    print("\n⚙️  Precompiling Python sources...")
+
+    try:
+        subprocess.run([sys.executable, '-m', 'compileall', '-q',
+                        'instagram_youtube_automation.py',
+                        'test_setup.py',
+                        'codespaces_setup.py'],
+                      check=True, capture_output=True, text=True)
+        print("✅ Bytecode cache generated")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Error precompiling sources: {e}")
+        print(f"Error output: {e.stderr}")
+        return False
+
 def test_setup():
     """Test the complete setup"""
     print("\n🧪 Testing setup...")
@@ -148,6 +169,7 @@ def main():
     steps = [
         ("Checking GitHub Secrets", check_github_secrets),
         ("Installing Dependencies", install_dependencies),
+        ("Precompiling Sources", precompile_sources),
         ("Setting up YouTube Credentials", setup_youtube_credentials),
         ("Creating Configuration", create_config_file),
         ("Testing Setup", test_setup)
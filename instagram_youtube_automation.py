@@ -6,14 +6,19 @@ with duplication check, timed scheduling, and Telegram bot control.
 Optimized for GitHub Codespaces deployment.
 """
 
+import functools
 import os
 import json
 import logging
 import schedule
+import string
 import time
-import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional
+import httpx
 import instaloader
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
@@ -27,6 +32,12 @@ import asyncio
 import tempfile
 import shutil
 
+# Optional: Bloom-filter fast path for very large posted histories
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -54,20 +65,90 @@ YOUTUBE_API_VERSION = 'v3'
 # Configuration file path
 CONFIG_FILE = 'config.json'
 
+# Append-only log of uploaded shortcodes (one per line)
+POSTED_LOG_FILE = 'posted.log'
+
+# Instagram session persistence and profile cache TTL
+INSTA_SESSION_FILE = 'insta.session'
+PROFILE_CACHE_TTL = 21600  # 6 hours
+
+# Daily upload slots
+UPLOAD_TIMES = ('06:00', '12:00', '17:00')
+
+# Prompt template for AI metadata generation, parsed once at import
+METADATA_PROMPT = string.Template("""
+            Create optimized YouTube metadata for this Instagram Reel:
+
+            Original Caption: $caption
+            Creator: @$username
+
+            Generate:
+            1. Title (max 70 characters, engaging and clickable)
+            2. Description (max 5000 characters, include "Credit to the original creator: @$username")
+            3. Tags (10 relevant tags, comma-separated)
+
+            Format as JSON:
+            {
+                "title": "Your Title Here",
+                "description": "Your description here...\n\nCredit to the original creator: @$username",
+                "tags": ["tag1", "tag2", "tag3", ...]
+            }
+            """)
+
+@dataclass(slots=True)
+class Reel:
+    """A candidate Instagram reel; slots keep per-reel memory fixed"""
+    shortcode: str
+    caption: str
+    caption_short: str
+    username: str
+    date: datetime
+    video_url: str
+    thumbnail_url: str
+
 class InstagramYouTubeAutomation:
     def __init__(self):
         self.config = self.load_config()
+        # In-memory set for O(1) duplicate checks, backed by the append-only
+        # log; the legacy POSTED_SHORTCODES list in config.json is folded in
+        self._posted_set = set(self.config.get('POSTED_SHORTCODES', []))
+        self._posted_set.update(self._load_posted_log())
+        # Optional Bloom filter in front of the set; only worth enabling once
+        # the posted history is large enough for the set to hurt
+        self._bloom = None
+        if self.config.get('USE_BLOOM_FILTER') and ScalableBloomFilter is not None:
+            self._bloom = ScalableBloomFilter(initial_capacity=10000, error_rate=0.001)
+            for code in self._posted_set:
+                self._bloom.add(code)
+        # Event loop the bot runs on; set once the application starts
+        self._loop = None
+        # Instagram Profile objects are expensive to resolve; cache with a TTL
+        self._profile_cache = {}
+        # Rendered bot replies, invalidated whenever the underlying data changes
+        self._reply_cache = {}
         self.insta_loader = None
         self.youtube_service = None
         self.openai_client = None
-        self.upload_queue = []
-        self.setup_services()
-        
+        # One pooled async HTTP client shared by the OpenAI SDK and the reel
+        # CDN downloads: a single TLS context and reused keep-alive
+        # connections instead of a fresh handshake per call
+        self._httpx = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+        self._tmp_root = tempfile.mkdtemp(prefix='reels_')
+        # Services are brought up lazily on first use so the bot can start
+        # answering commands before any login/OAuth work happens
+        self._insta_lock = asyncio.Lock()
+        self._youtube_lock = asyncio.Lock()
+        self._openai_lock = asyncio.Lock()
+
     def load_config(self) -> Dict:
         """Load configuration from config.json file"""
         default_config = {
             "TARGET_INSTAGRAM_ACCOUNTS": [],
             "POSTED_SHORTCODES": [],
+            "USE_BLOOM_FILTER": False,
             "last_run": None
         }
         
@@ -88,22 +169,54 @@ class InstagramYouTubeAutomation:
             self.save_config(default_config)
             return default_config
     
+    def _load_posted_log(self) -> set:
+        """Load posted shortcodes from the append-only log"""
+        try:
+            with open(POSTED_LOG_FILE, 'r') as f:
+                return {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            logger.error(f"Error reading posted log: {e}")
+            return set()
+
+    def _is_posted(self, shortcode: str) -> bool:
+        """Duplicate check; the optional Bloom filter screens misses cheaply"""
+        if self._bloom is not None and shortcode not in self._bloom:
+            return False
+        return shortcode in self._posted_set
+
+    def _mark_posted(self, shortcode: str):
+        """Record an uploaded shortcode in memory and the append-only log"""
+        self._posted_set.add(shortcode)
+        if self._bloom is not None:
+            self._bloom.add(shortcode)
+        self._reply_cache.pop('duplicates', None)
+        try:
+            with open(POSTED_LOG_FILE, 'a') as f:
+                f.write(shortcode + '\n')
+        except Exception as e:
+            logger.error(f"Error recording posted shortcode {shortcode}: {e}")
+
     def save_config(self, config: Dict = None):
         """Save configuration to config.json file"""
         if config is None:
             config = self.config
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Write to a temp file and atomically swap it in, so a crash
+            # mid-write can never leave a truncated config behind
+            tmp_file = CONFIG_FILE + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(config, f, separators=(',', ':'))
+            os.replace(tmp_file, CONFIG_FILE)
             logger.info("Configuration saved successfully")
         except Exception as e:
             logger.error(f"Error saving config: {e}")
     
-    def setup_services(self):
-        """Initialize all required services"""
+    def _setup_instagram(self):
+        """Initialize the Instagram loader and log in (blocking)"""
         try:
-            # Setup Instagram loader
-            self.insta_loader = instaloader.Instaloader(
+            loader = instaloader.Instaloader(
                 download_pictures=False,
                 download_videos=True,
                 download_video_thumbnails=False,
@@ -112,24 +225,48 @@ class InstagramYouTubeAutomation:
                 save_metadata=False,
                 compress_json=False
             )
-            
-            # Login to Instagram
-            if INSTA_USERNAME and INSTA_PASSWORD:
-                self.insta_loader.login(INSTA_USERNAME, INSTA_PASSWORD)
-                logger.info("Instagram login successful")
-            
-            # Setup YouTube service
-            self.setup_youtube_service()
-            
-            # Setup OpenAI client
-            if OPENAI_API_KEY:
-                openai.api_key = OPENAI_API_KEY
-                self.openai_client = openai
-                logger.info("OpenAI client initialized")
-            
+
+            # Login to Instagram, restoring the saved session when possible
+            # so restarts don't pay for a fresh login
+            if INSTA_USERNAME:
+                try:
+                    loader.load_session_from_file(INSTA_USERNAME, INSTA_SESSION_FILE)
+                    logger.info("Instagram session restored from file")
+                except Exception:
+                    if INSTA_PASSWORD:
+                        loader.login(INSTA_USERNAME, INSTA_PASSWORD)
+                        loader.save_session_to_file(INSTA_SESSION_FILE)
+                        logger.info("Instagram login successful")
+
+            self.insta_loader = loader
         except Exception as e:
-            logger.error(f"Error setting up services: {e}")
-    
+            logger.error(f"Error setting up Instagram loader: {e}")
+
+    async def _ensure_insta(self):
+        """Bring up the Instagram loader on first use"""
+        if self.insta_loader is None:
+            async with self._insta_lock:
+                if self.insta_loader is None:
+                    await asyncio.to_thread(self._setup_instagram)
+
+    async def _ensure_youtube(self):
+        """Bring up the YouTube service on first use"""
+        if self.youtube_service is None:
+            async with self._youtube_lock:
+                if self.youtube_service is None:
+                    await asyncio.to_thread(self.setup_youtube_service)
+
+    async def _ensure_openai(self):
+        """Bring up the OpenAI client on first use"""
+        if self.openai_client is None and OPENAI_API_KEY:
+            async with self._openai_lock:
+                if self.openai_client is None:
+                    self.openai_client = openai.AsyncOpenAI(
+                        api_key=OPENAI_API_KEY,
+                        http_client=self._httpx
+                    )
+                    logger.info("OpenAI client initialized")
+
     def setup_youtube_service(self):
         """Setup YouTube API service with OAuth2 authentication"""
         try:
@@ -158,34 +295,45 @@ class InstagramYouTubeAutomation:
                 with open(token_file, 'w') as token:
                     token.write(creds.to_json())
             
+            # static_discovery uses the discovery document bundled with the
+            # client library, skipping the HTTPS fetch (and its cache) that
+            # build() would otherwise perform on every startup
             self.youtube_service = build(
-                YOUTUBE_API_SERVICE_NAME, 
-                YOUTUBE_API_VERSION, 
-                credentials=creds
+                YOUTUBE_API_SERVICE_NAME,
+                YOUTUBE_API_VERSION,
+                credentials=creds,
+                cache_discovery=False,
+                static_discovery=True
             )
             logger.info("YouTube service initialized successfully")
             
         except Exception as e:
             logger.error(f"Error setting up YouTube service: {e}")
     
-    def get_instagram_reels(self, username: str, max_posts: int = 50) -> List[Dict]:
+    def get_instagram_reels(self, username: str, max_posts: int = 50) -> List[Reel]:
         """Get Instagram Reels from a specific account"""
         try:
-            profile = instaloader.Profile.from_username(self.insta_loader.context, username)
+            cached = self._profile_cache.get(username)
+            if cached and time.time() - cached[1] < PROFILE_CACHE_TTL:
+                profile = cached[0]
+            else:
+                profile = instaloader.Profile.from_username(self.insta_loader.context, username)
+                self._profile_cache[username] = (profile, time.time())
             reels = []
-            
+
             for post in profile.get_posts():
                 if post.is_video and post.typename == 'GraphVideo':
-                    reel_data = {
-                        'shortcode': post.shortcode,
-                        'caption': post.caption or '',
-                        'username': username,
-                        'date': post.date,
-                        'video_url': post.video_url,
-                        'thumbnail_url': post.url
-                    }
-                    reels.append(reel_data)
-                    
+                    caption = post.caption or ''
+                    reels.append(Reel(
+                        shortcode=post.shortcode,
+                        caption=caption,
+                        caption_short=caption[:180],
+                        username=username,
+                        date=post.date,
+                        video_url=post.video_url,
+                        thumbnail_url=post.url
+                    ))
+
                     if len(reels) >= max_posts:
                         break
             
@@ -196,77 +344,67 @@ class InstagramYouTubeAutomation:
             logger.error(f"Error getting reels from @{username}: {e}")
             return []
     
-    def download_reel(self, reel_data: Dict) -> Optional[str]:
+    async def download_reel(self, reel: Reel) -> Optional[str]:
         """Download a single Instagram Reel"""
         try:
-            # Create temporary directory for downloads
-            temp_dir = tempfile.mkdtemp()
-            filename = f"{reel_data['shortcode']}.mp4"
-            filepath = os.path.join(temp_dir, filename)
-            
-            # Download the video
-            self.insta_loader.download_video(reel_data['video_url'], filepath)
-            
+            filename = f"{reel.shortcode}.mp4"
+            filepath = os.path.join(self._tmp_root, filename)
+
+            # Stream the video straight to disk in 512KB chunks over a pooled
+            # keep-alive connection
+            async with self._httpx.stream('GET', reel.video_url) as response:
+                response.raise_for_status()
+                with open(filepath, 'wb') as f:
+                    async for chunk in response.aiter_bytes(524288):
+                        f.write(chunk)
+
             if os.path.exists(filepath):
-                logger.info(f"Downloaded reel: {reel_data['shortcode']}")
+                logger.info(f"Downloaded reel: {reel.shortcode}")
                 return filepath
             else:
-                logger.error(f"Failed to download reel: {reel_data['shortcode']}")
+                logger.error(f"Failed to download reel: {reel.shortcode}")
                 return None
-                
+
         except Exception as e:
-            logger.error(f"Error downloading reel {reel_data['shortcode']}: {e}")
+            logger.error(f"Error downloading reel {reel.shortcode}: {e}")
             return None
     
-    def generate_youtube_metadata(self, reel_data: Dict) -> Dict:
+    async def generate_youtube_metadata(self, reel: Reel) -> Dict:
         """Generate YouTube metadata using OpenAI API"""
         try:
             if not self.openai_client:
-                return self.generate_fallback_metadata(reel_data)
-            
-            prompt = f"""
-            Create optimized YouTube metadata for this Instagram Reel:
-            
-            Original Caption: {reel_data['caption'][:200]}...
-            Creator: @{reel_data['username']}
-            
-            Generate:
-            1. Title (max 70 characters, engaging and clickable)
-            2. Description (max 5000 characters, include "Credit to the original creator: @{reel_data['username']}")
-            3. Tags (10 relevant tags, comma-separated)
-            
-            Format as JSON:
-            {{
-                "title": "Your Title Here",
-                "description": "Your description here...\n\nCredit to the original creator: @{reel_data['username']}",
-                "tags": ["tag1", "tag2", "tag3", ...]
-            }}
-            """
-            
-            response = self.openai_client.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+                return self.generate_fallback_metadata(reel)
+
+            prompt = METADATA_PROMPT.substitute(
+                caption=reel.caption_short,
+                username=reel.username
+            )
+
+            response = await self.openai_client.chat.completions.create(
+                model="gpt-3.5-turbo-0125",
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
+                response_format={"type": "json_object"},
+                max_tokens=300,
                 temperature=0.7
             )
-            
+
             metadata = json.loads(response.choices[0].message.content)
-            logger.info(f"Generated AI metadata for {reel_data['shortcode']}")
+            logger.info(f"Generated AI metadata for {reel.shortcode}")
             return metadata
             
         except Exception as e:
             logger.error(f"Error generating AI metadata: {e}")
-            return self.generate_fallback_metadata(reel_data)
+            return self.generate_fallback_metadata(reel)
     
-    def generate_fallback_metadata(self, reel_data: Dict) -> Dict:
+    def generate_fallback_metadata(self, reel: Reel) -> Dict:
         """Generate fallback metadata without AI"""
-        title = f"Instagram Reel by @{reel_data['username']}"
+        title = f"Instagram Reel by @{reel.username}"
         if len(title) > 70:
             title = title[:67] + "..."
         
-        description = f"Credit to the original creator: @{reel_data['username']}\n\n"
-        if reel_data['caption']:
-            description += f"Original caption: {reel_data['caption'][:1000]}"
+        description = f"Credit to the original creator: @{reel.username}\n\n"
+        if reel.caption:
+            description += f"Original caption: {reel.caption[:1000]}"
         
         tags = [
             "instagram", "reel", "viral", "trending", "short", "video",
@@ -299,34 +437,37 @@ class InstagramYouTubeAutomation:
                 }
             }
             
-            # Create media upload
-            media = MediaFileUpload(file_path, chunksize=-1, resumable=True)
-            
+            # Create media upload; a bounded chunk size streams the file from
+            # disk instead of loading the whole video into memory
+            media = MediaFileUpload(
+                file_path,
+                mimetype='video/mp4',
+                chunksize=524288,
+                resumable=True
+            )
+
             # Execute upload
             insert_request = self.youtube_service.videos().insert(
                 part=','.join(body.keys()),
                 body=body,
                 media_body=media
             )
-            
-            # Execute the upload
-            response = insert_request.execute()
+
+            # Upload chunk by chunk so transient errors only retry one chunk
+            response = None
+            while response is None:
+                status, response = insert_request.next_chunk()
+                if status:
+                    logger.info(f"Upload progress for {shortcode}: {int(status.progress() * 100)}%")
             
             if 'id' in response:
                 video_id = response['id']
                 logger.info(f"Successfully uploaded {shortcode} as YouTube video: {video_id}")
                 
-                # Add shortcode to posted list
-                self.config['POSTED_SHORTCODES'].append(shortcode)
-                self.save_config()
-                
-                # Delete the local file
-                try:
-                    os.remove(file_path)
-                    logger.info(f"Deleted local file: {file_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting file {file_path}: {e}")
-                
+                # Record the shortcode without rewriting the whole config;
+                # the local file is cleaned up with the per-run directory
+                self._mark_posted(shortcode)
+
                 return True
             else:
                 logger.error(f"Upload failed for {shortcode}")
@@ -336,7 +477,21 @@ class InstagramYouTubeAutomation:
             logger.error(f"Error uploading {shortcode} to YouTube: {e}")
             return False
     
-    def run_automation(self) -> Dict:
+    async def _prepare_reel(self, reel: Reel, sem: asyncio.Semaphore) -> Optional[Dict]:
+        """Download a reel and generate its metadata, bounded by the semaphore"""
+        async with sem:
+            file_path = await self.download_reel(reel)
+            if not file_path:
+                return None
+            metadata = await self.generate_youtube_metadata(reel)
+            return {
+                'file_path': file_path,
+                'metadata': metadata,
+                'shortcode': reel.shortcode,
+                'username': reel.username
+            }
+
+    async def run_automation(self) -> Dict:
         """Main automation function - download and prepare videos for upload"""
         logger.info("Starting daily automation process")
         results = {
@@ -345,101 +500,112 @@ class InstagramYouTubeAutomation:
             'old_videos_used': 0,
             'errors': []
         }
-        
+
         try:
+            # Lazy service bring-up: pay the login/OAuth cost on the first
+            # run instead of at bot startup
+            await self._ensure_insta()
+            await self._ensure_openai()
+            await self._ensure_youtube()
+
+            # Downloads live in a per-run directory; wipe the previous run's
+            # files (uploaded or abandoned) before filling it again so failed
+            # uploads can never accumulate on disk. Any upload jobs still
+            # pointing at those files must go with them, even if this run ends
+            # up scheduling nothing
+            schedule.clear('daily-uploads')
+            shutil.rmtree(self._tmp_root, ignore_errors=True)
+            self._tmp_root = tempfile.mkdtemp(prefix='reels_')
+
             selected_videos = []
             target_count = 3
-            
-            # Get reels from all target accounts
+
+            # Get reels from all target accounts concurrently; each fetch is
+            # network-bound, so overlapping them collapses N round-trips
             all_reels = []
-            for username in self.config['TARGET_INSTAGRAM_ACCOUNTS']:
-                reels = self.get_instagram_reels(username, max_posts=20)
-                all_reels.extend(reels)
-            
-            # Sort by date (newest first)
-            all_reels.sort(key=lambda x: x['date'], reverse=True)
-            
-            # Select videos with duplication check
-            for reel in all_reels:
-                if len(selected_videos) >= target_count:
-                    break
-                
-                # Check for duplicates
-                if reel['shortcode'] in self.config['POSTED_SHORTCODES']:
-                    results['duplicates_skipped'] += 1
-                    continue
-                
-                # Download the reel
-                file_path = self.download_reel(reel)
-                if file_path:
-                    # Generate metadata
-                    metadata = self.generate_youtube_metadata(reel)
-                    
-                    # Add to selected videos
-                    selected_videos.append({
-                        'file_path': file_path,
-                        'metadata': metadata,
-                        'shortcode': reel['shortcode'],
-                        'username': reel['username']
-                    })
-                    results['videos_selected'] += 1
-                else:
-                    results['errors'].append(f"Failed to download {reel['shortcode']}")
-            
-            # If we don't have enough new videos, try older content
-            if len(selected_videos) < target_count:
-                logger.info("Not enough new content, checking older reels...")
-                for reel in all_reels:
-                    if len(selected_videos) >= target_count:
-                        break
-                    
-                    if reel['shortcode'] in self.config['POSTED_SHORTCODES']:
-                        continue
-                    
-                    # Skip if already selected
-                    if any(v['shortcode'] == reel['shortcode'] for v in selected_videos):
+            accounts = self.config['TARGET_INSTAGRAM_ACCOUNTS']
+            if accounts:
+                reel_lists = await asyncio.gather(*(
+                    asyncio.to_thread(self.get_instagram_reels, username, 20)
+                    for username in accounts
+                ))
+                for reels in reel_lists:
+                    all_reels.extend(reels)
+
+            # Sort by date (newest first) and drop cross-account duplicates so
+            # the selection loop never revisits a shortcode
+            all_reels.sort(key=lambda x: x.date, reverse=True)
+            seen = set()
+            all_reels = [
+                reel for reel in all_reels
+                if not (reel.shortcode in seen or seen.add(reel.shortcode))
+            ]
+
+            # Downloads and metadata generation overlap across reels, capped
+            # so at most 3 reels are in flight at once. Newest reels are tried
+            # first, so older content is used automatically when fresh reels
+            # run out.
+            sem = asyncio.Semaphore(3)
+            recent_cutoff = datetime.now() - timedelta(days=7)
+
+            index = 0
+            while len(selected_videos) < target_count and index < len(all_reels):
+                pending = []
+                while index < len(all_reels) and len(selected_videos) + len(pending) < target_count:
+                    reel = all_reels[index]
+                    index += 1
+                    if self._is_posted(reel.shortcode):
+                        results['duplicates_skipped'] += 1
                         continue
-                    
-                    file_path = self.download_reel(reel)
-                    if file_path:
-                        metadata = self.generate_youtube_metadata(reel)
-                        selected_videos.append({
-                            'file_path': file_path,
-                            'metadata': metadata,
-                            'shortcode': reel['shortcode'],
-                            'username': reel['username']
-                        })
-                        results['old_videos_used'] += 1
+                    pending.append((reel, asyncio.create_task(self._prepare_reel(reel, sem))))
+
+                for reel, task in pending:
+                    prepared = await task
+                    if prepared:
+                        selected_videos.append(prepared)
                         results['videos_selected'] += 1
-            
+                        if reel.date < recent_cutoff:
+                            results['old_videos_used'] += 1
+                    else:
+                        results['errors'].append(f"Failed to download {reel.shortcode}")
+
             # Schedule uploads
             if selected_videos:
                 self.schedule_uploads(selected_videos)
                 logger.info(f"Scheduled {len(selected_videos)} videos for upload")
-            
+
             # Update last run time
             self.config['last_run'] = datetime.now().isoformat()
+            self._reply_cache.pop('status', None)
             self.save_config()
-            
+
         except Exception as e:
             logger.error(f"Error in automation process: {e}")
             results['errors'].append(str(e))
-        
+
         return results
+
+    def run_automation_job(self):
+        """Sync entry point for the scheduler: run run_automation on the bot's loop"""
+        if self._loop is None:
+            logger.error("Event loop not available; skipping scheduled automation")
+            return None
+        future = asyncio.run_coroutine_threadsafe(self.run_automation(), self._loop)
+        return future.result()
     
     def schedule_uploads(self, videos: List[Dict]):
         """Schedule video uploads at specific times"""
-        upload_times = ['06:00', '12:00', '17:00']
-        
+        # Jobs from previous runs are cleared in run_automation, alongside
+        # the removal of the files they reference
         for i, video in enumerate(videos):
-            if i < len(upload_times):
-                time_str = upload_times[i]
+            if i < len(UPLOAD_TIMES):
+                time_str = UPLOAD_TIMES[i]
                 schedule.every().day.at(time_str).do(
-                    self.upload_scheduled_video, 
-                    video['file_path'], 
-                    video['metadata'], 
+                    self.upload_scheduled_video,
+                    video['file_path'],
+                    video['metadata'],
                     video['shortcode']
-                )
+                ).tag('daily-uploads')
                 logger.info(f"Scheduled {video['shortcode']} for upload at {time_str}")
     
     def upload_scheduled_video(self, file_path: str, metadata: Dict, shortcode: str):
@@ -453,12 +619,33 @@ class InstagramYouTubeAutomation:
             logger.error(f"Failed to upload scheduled video: {shortcode}")
 
 # Telegram Bot Functions
+
+# Unauthorized users get at most one reply per window; repeat pings inside
+# the window are dropped without spending an outbound API call
+UNAUTHORIZED_REPLY_WINDOW = 60.0
+_unauthorized_hits = {}
+
+def require_auth(handler):
+    """Reject updates from anyone but the authorized user before the handler runs"""
+    @functools.wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user_id = update.effective_user.id
+        if user_id != AUTHORIZED_TELEGRAM_USER_ID:
+            now = time.monotonic()
+            hits = _unauthorized_hits.setdefault(user_id, deque(maxlen=16))
+            while hits and now - hits[0] > UNAUTHORIZED_REPLY_WINDOW:
+                hits.popleft()
+            first_in_window = not hits
+            hits.append(now)
+            if first_in_window:
+                await update.message.reply_text("Unauthorized access.")
+            return None
+        return await handler(update, context)
+    return wrapper
+
+@require_auth
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command"""
-    if update.effective_user.id != AUTHORIZED_TELEGRAM_USER_ID:
-        await update.message.reply_text("Unauthorized access.")
-        return
-    
     await update.message.reply_text(
         "🤖 Instagram to YouTube Automation Bot is running!\n\n"
         "Available commands:\n"
@@ -470,16 +657,13 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/check_duplicates - Check posted count"
     )
 
+@require_auth
 async def run_manual_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /run_manual command"""
-    if update.effective_user.id != AUTHORIZED_TELEGRAM_USER_ID:
-        await update.message.reply_text("Unauthorized access.")
-        return
-    
     await update.message.reply_text("🔄 Running manual automation...")
     
     try:
-        results = automation.run_automation()
+        results = await automation.run_automation()
         
         message = f"✅ Automation completed!\n\n"
         message += f"📹 Videos selected: {results['videos_selected']}\n"
@@ -496,29 +680,26 @@ async def run_manual_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     except Exception as e:
         await update.message.reply_text(f"❌ Error running automation: {str(e)}")
 
+@require_auth
 async def list_accounts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /list_accounts command"""
-    if update.effective_user.id != AUTHORIZED_TELEGRAM_USER_ID:
-        await update.message.reply_text("Unauthorized access.")
-        return
-    
-    accounts = automation.config.get('TARGET_INSTAGRAM_ACCOUNTS', [])
-    
-    if accounts:
-        message = "📋 Target Instagram Accounts:\n\n"
-        for i, account in enumerate(accounts, 1):
-            message += f"{i}. @{account}\n"
-    else:
-        message = "📋 No target accounts configured."
-    
+    message = automation._reply_cache.get('accounts')
+    if message is None:
+        accounts = automation.config.get('TARGET_INSTAGRAM_ACCOUNTS', [])
+
+        if accounts:
+            message = "📋 Target Instagram Accounts:\n\n"
+            for i, account in enumerate(accounts, 1):
+                message += f"{i}. @{account}\n"
+        else:
+            message = "📋 No target accounts configured."
+        automation._reply_cache['accounts'] = message
+
     await update.message.reply_text(message)
 
+@require_auth
 async def add_account_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /add_account command"""
-    if update.effective_user.id != AUTHORIZED_TELEGRAM_USER_ID:
-        await update.message.reply_text("Unauthorized access.")
-        return
-    
     if not context.args:
         await update.message.reply_text("Usage: /add_account [username]")
         return
@@ -530,16 +711,15 @@ async def add_account_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
     
     automation.config['TARGET_INSTAGRAM_ACCOUNTS'].append(username)
+    automation._reply_cache.pop('accounts', None)
+    automation._reply_cache.pop('status', None)
     automation.save_config()
-    
+
     await update.message.reply_text(f"✅ Added @{username} to target accounts.")
 
+@require_auth
 async def edit_metadata_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /edit_metadata command"""
-    if update.effective_user.id != AUTHORIZED_TELEGRAM_USER_ID:
-        await update.message.reply_text("Unauthorized access.")
-        return
-    
     if len(context.args) < 2:
         await update.message.reply_text("Usage: /edit_metadata [video_id] [new_title]")
         return
@@ -548,6 +728,7 @@ async def edit_metadata_command(update: Update, context: ContextTypes.DEFAULT_TY
     new_title = ' '.join(context.args[1:])
     
     try:
+        await automation._ensure_youtube()
         if not automation.youtube_service:
             await update.message.reply_text("❌ YouTube service not available.")
             return
@@ -576,31 +757,31 @@ async def edit_metadata_command(update: Update, context: ContextTypes.DEFAULT_TY
     except Exception as e:
         await update.message.reply_text(f"❌ Error updating metadata: {str(e)}")
 
+@require_auth
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /status command"""
-    if update.effective_user.id != AUTHORIZED_TELEGRAM_USER_ID:
-        await update.message.reply_text("Unauthorized access.")
-        return
-    
-    last_run = automation.config.get('last_run', 'Never')
-    message = f"📊 Automation Status\n\n"
-    message += f"🕐 Last run: {last_run}\n"
-    message += f"📅 Next uploads:\n"
-    message += f"• 6:00 AM\n"
-    message += f"• 12:00 PM\n"
-    message += f"• 5:00 PM\n"
-    message += f"📹 Target accounts: {len(automation.config.get('TARGET_INSTAGRAM_ACCOUNTS', []))}"
-    
+    message = automation._reply_cache.get('status')
+    if message is None:
+        last_run = automation.config.get('last_run', 'Never')
+        message = f"📊 Automation Status\n\n"
+        message += f"🕐 Last run: {last_run}\n"
+        message += f"📅 Next uploads:\n"
+        message += f"• 6:00 AM\n"
+        message += f"• 12:00 PM\n"
+        message += f"• 5:00 PM\n"
+        message += f"📹 Target accounts: {len(automation.config.get('TARGET_INSTAGRAM_ACCOUNTS', []))}"
+        automation._reply_cache['status'] = message
+
     await update.message.reply_text(message)
 
+@require_auth
 async def check_duplicates_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /check_duplicates command"""
-    if update.effective_user.id != AUTHORIZED_TELEGRAM_USER_ID:
-        await update.message.reply_text("Unauthorized access.")
-        return
-    
-    posted_count = len(automation.config.get('POSTED_SHORTCODES', []))
-    await update.message.reply_text(f"📊 Posted shortcodes count: {posted_count}")
+    message = automation._reply_cache.get('duplicates')
+    if message is None:
+        message = f"📊 Posted shortcodes count: {len(automation._posted_set)}"
+        automation._reply_cache['duplicates'] = message
+    await update.message.reply_text(message)
 
 def setup_telegram_bot():
     """Setup and configure Telegram bot"""
@@ -608,7 +789,12 @@ def setup_telegram_bot():
         logger.error("Telegram bot token not provided")
         return None
     
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .post_init(start_scheduler)
+        .build()
+    )
     
     # Add command handlers
     application.add_handler(CommandHandler("start", start_command))
@@ -621,11 +807,27 @@ def setup_telegram_bot():
     
     return application
 
-def run_scheduler():
-    """Run the scheduler in a separate thread"""
+async def scheduler_loop():
+    """Drive scheduled jobs from the bot's event loop"""
     while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+        # Sleep until the next scheduled job instead of waking every minute,
+        # capped so newly registered jobs are still picked up promptly
+        delay = schedule.idle_seconds()
+        if delay is None:
+            delay = 60
+        await asyncio.sleep(max(1, min(delay, 600)))
+        # Jobs are plain sync functions; run them off the event loop
+        await asyncio.to_thread(schedule.run_pending)
+
+async def start_scheduler(application):
+    """post_init hook: attach the scheduler to the bot's event loop"""
+    loop = asyncio.get_running_loop()
+    # Cap the pool that asyncio.to_thread / run_in_executor dispatch to; four
+    # workers matches the natural parallelism (one per target-account fetch)
+    # without paying the context-switch tax of a thread per task
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=4, thread_name_prefix='io'))
+    automation._loop = loop
+    application.create_task(scheduler_loop())
 
 def main():
     """Main function to run the automation"""
@@ -640,13 +842,10 @@ def main():
         logger.error("Failed to setup Telegram bot")
         return
     
-    # Schedule daily automation at 10 PM
-    schedule.every().day.at("22:00").do(automation.run_automation)
-    
-    # Start scheduler in background thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
-    
+    # Schedule daily automation at 10 PM; the scheduler itself runs inside
+    # the bot's event loop (see start_scheduler)
+    schedule.every().day.at("22:00").do(automation.run_automation_job)
+
     logger.info("Starting Instagram to YouTube automation...")
     logger.info("Telegram bot is running...")
     logger.info("Daily automation scheduled for 10:00 PM")